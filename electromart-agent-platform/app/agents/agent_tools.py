@@ -1,7 +1,7 @@
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 from crewai.tools import tool
-from pydantic import BaseModel, Field
 
 from app.core.logs import get_logger
 from app.knowledge_base.vector_store import get_vector_store
@@ -9,31 +9,26 @@ from app.services.data_service import get_data_service
 
 logger = get_logger()
 
+# Module-level service bindings so every tool invocation skips the
+# singleton lookup in the hot path
+_VS = None
+_DS = None
 
-# Tool Input Schemas
 
-class ProductSearchInput(BaseModel):
-    """Input schema for product search tool"""
-    query: str = Field(..., description="Search query for products")
-    category: Optional[str] = Field(None, description="Filter by category")
-    max_results: int = Field(5, description="Maximum number of results to return")
+def _vs():
+    """Get the vector store, binding it locally on first use"""
+    global _VS
+    if _VS is None:
+        _VS = get_vector_store()
+    return _VS
 
 
-class OrderLookupInput(BaseModel):
-    """Input schema for order lookup tool"""
-    order_id: str = Field(..., description="Order ID to look up")
-
-
-class PromotionSearchInput(BaseModel):
-    """Input schema for promotion search tool"""
-    query: Optional[str] = Field(None, description="Search query for promotions")
-    category: Optional[str] = Field(None, description="Filter by category")
-
-
-class KnowledgeBaseSearchInput(BaseModel):
-    """Input schema for knowledge base search tool"""
-    query: str = Field(..., description="Search query for knowledge base")
-    kb_type: str = Field(..., description="Knowledge base type: technical_support, return_policy, shipping_policy, store_info, loyalty_program")
+def _ds():
+    """Get the data service, binding it locally on first use"""
+    global _DS
+    if _DS is None:
+        _DS = get_data_service()
+    return _DS
 
 
 # Tool Functions
@@ -41,35 +36,40 @@ class KnowledgeBaseSearchInput(BaseModel):
 def product_search_func(query: str, category: Optional[str] = None, max_results: int = 5) -> str:
     """Execute product search"""
     try:
-        logger.info(f"Product search: query='{query}', category='{category}'")
+        logger.debug(f"Product search: query='{query}', category='{category}'")
 
-        vector_store = get_vector_store()
-        # data_service = get_data_service()
+        vector_store = _vs()
 
-        # Use vector store for semantic search
-        products = vector_store.search_products(query, n_results=max_results)
-
-        # If category specified, filter results
-        if category and products:
-            products = [p for p in products if p.get('category', '').lower() == category.lower()]
+        # Resolve category to its stored form once, keeping matching case-insensitive
+        if category:
+            category_lower = category.lower()
+            category = next(
+                (c for c in {p.get('category', '') for p in _ds().get_all_products()}
+                 if c.lower() == category_lower),
+                None
+            )
+            if category is None:
+                return f"No products found matching '{query}'."
+
+        # Use vector store for semantic search with server-side category
+        # filter; search_products yields, so results are formatted as
+        # they come without an intermediate list
+        products = vector_store.search_products(query, n_results=max_results, category=category)
+
+        formatted = "\n\n".join(
+            f"**{product['name']}** (ID: {product['id']})\n"
+            f"- Brand: {product['brand']}\n"
+            f"- Category: {product['category']}\n"
+            f"- Price: ${product['price']}\n"
+            f"- Stock: {product['stock_status']} ({product['stock_quantity']} units)\n"
+            f"- Description: {product['description']}\n"
+            for product in products
+        )
 
-        if not products:
+        if not formatted:
             return f"No products found matching '{query}'."
 
-        # Format results
-        results = []
-        for product in products[:max_results]:
-            result = (
-                f"**{product['name']}** (ID: {product['id']})\n"
-                f"- Brand: {product['brand']}\n"
-                f"- Category: {product['category']}\n"
-                f"- Price: ${product['price']}\n"
-                f"- Stock: {product['stock_status']} ({product['stock_quantity']} units)\n"
-                f"- Description: {product['description']}\n"
-            )
-            results.append(result)
-
-        return "\n\n".join(results)
+        return formatted
 
     except Exception as e:
         logger.error(f"Error in product search: {e}")
@@ -79,19 +79,19 @@ def product_search_func(query: str, category: Optional[str] = None, max_results:
 def order_lookup_func(order_id: str) -> str:
     """Execute order lookup"""
     try:
-        logger.info(f"Order lookup: order_id='{order_id}'")
+        logger.debug(f"Order lookup: order_id='{order_id}'")
 
-        data_service = get_data_service()
+        data_service = _ds()
         order = data_service.get_order_by_id(order_id)
 
         if not order:
             return f"Order {order_id} not found. Please verify the order ID."
 
         # Format order details
-        items_text = "\n".join([
+        items_text = "\n".join(
             f"  - {item['product_name']} (Qty: {item['quantity']}) - ${item['price']}"
-            for item in order.get('items', [])
-        ])
+            for item in order.get('items', ())
+        )
 
         tracking_info = ""
         if order.get('tracking_number'):
@@ -124,33 +124,34 @@ def order_lookup_func(order_id: str) -> str:
 def promotion_search_func(query: Optional[str] = None, category: Optional[str] = None) -> str:
     """Execute promotion search"""
     try:
-        logger.info(f"Promotion search: query='{query}', category='{category}'")
+        logger.debug(f"Promotion search: query='{query}', category='{category}'")
 
-        data_service = get_data_service()
+        data_service = _ds()
 
         # Get active promotions
         if category:
             promotions = data_service.get_promotions_by_category(category)
+            # Filter by query if provided
+            if query and promotions:
+                query_lower = query.lower()
+                promotions = [
+                    p for p in promotions
+                    if query_lower in p.get('name', '').lower()
+                    or query_lower in p.get('description', '').lower()
+                ]
+        elif query:
+            # Query filtering runs against the precomputed lowercase index
+            promotions = data_service.search_promotions(query, active_only=True)
         else:
             promotions = data_service.get_all_promotions(active_only=True)
 
-        # Filter by query if provided
-        if query and promotions:
-            query_lower = query.lower()
-            promotions = [
-                p for p in promotions
-                if query_lower in p.get('name', '').lower()
-                or query_lower in p.get('description', '').lower()
-            ]
-
         if not promotions:
             return "No active promotions found at this time."
 
         # Format results
-        results = []
-        for promo in promotions:
+        def _format_promo(promo: dict) -> str:
             requirements = f"\n- Requirements: {promo['requirements']}" if promo.get('requirements') else ""
-            result = (
+            return (
                 f"**{promo['name']}** (Code: {promo['code']})\n"
                 f"- {promo['description']}\n"
                 f"- Discount: {promo['discount_value']}{'%' if promo['discount_type'] == 'percentage' else '$'}\n"
@@ -158,9 +159,8 @@ def promotion_search_func(query: Optional[str] = None, category: Optional[str] =
                 f"- Valid: {promo['start_date']} to {promo['end_date']}"
                 f"{requirements}"
             )
-            results.append(result)
 
-        return "\n\n".join(results)
+        return "\n\n".join(_format_promo(promo) for promo in promotions)
 
     except Exception as e:
         logger.error(f"Error in promotion search: {e}")
@@ -168,23 +168,26 @@ def promotion_search_func(query: Optional[str] = None, category: Optional[str] =
 
 
 def knowledge_base_search_func(query: str, kb_type: str = "default") -> str:
-    """Execute knowledge base search"""
+    """Execute knowledge base search. kb_type accepts a comma-separated list
+    of collections for multi-intent queries."""
     try:
         # Map 'default' to a real collection
         if kb_type == "default":
             kb_type = "technical_support"
 
-        logger.info(f"KB search: query='{query}', kb_type='{kb_type}'")
+        logger.debug(f"KB search: query='{query}', kb_type='{kb_type}'")
 
-        vector_store = get_vector_store()
+        vector_store = _vs()
 
-        # Check collection exists
-        if kb_type not in vector_store.collections:
-            logger.error(f"Collection '{kb_type}' does not exist in vector store")
-            return f"No relevant information found: collection '{kb_type}' does not exist."
+        # Check collections exist
+        kb_types = [kb.strip() for kb in kb_type.split(',') if kb.strip()]
+        missing = [kb for kb in kb_types if kb not in vector_store.collections]
+        if missing:
+            logger.error(f"Collections {missing} do not exist in vector store")
+            return f"No relevant information found: collection '{missing[0]}' does not exist."
 
-        # Search using RAG
-        articles = vector_store.search_knowledge_base(query, kb_type, n_results=3)
+        # Search using RAG, in parallel across collections when several given
+        articles = vector_store.search_kbs(query, kb_types, n_results=3)
 
         if not articles:
             return f"No relevant information found in {kb_type} knowledge base."
@@ -205,6 +208,23 @@ def knowledge_base_search_func(query: str, kb_type: str = "default") -> str:
         return f"Error searching knowledge base: {str(e)}"
 
 
+_search_executor = ThreadPoolExecutor(max_workers=4)
+
+
+def submit_search(func: Callable[..., str], *args):
+    """
+    Submit a single search to the shared executor without waiting.
+
+    Args:
+        func: Search function to run
+        *args: Arguments for the search function
+
+    Returns:
+        Future resolving to the search result
+    """
+    return _search_executor.submit(func, *args)
+
+
 # Create Tool instances for agents
 
 @tool("Product Search")
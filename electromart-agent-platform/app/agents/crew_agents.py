@@ -1,58 +1,432 @@
+import functools
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
 from crewai import Agent, Task, Crew
 
 from app.agents.agent_tools import product_search_tool, promotion_search_tool, knowledge_base_search_tool, \
-    order_lookup_tool
+    order_lookup_tool, product_search_func, promotion_search_func, knowledge_base_search_func, submit_search
 from app.core.config import settings
 from app.core.logs import get_logger
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 logger = get_logger()
 
+# Static system prompt for direct-LLM classification. Keeping it stable and
+# first in the message list preserves the prefix-caching invariant.
+_ORCHESTRATOR_SYSTEM_PROMPT = """You route ElectroMart customer messages to the right specialized agent.
+
+Available agents:
+- sales: Product inquiries, pricing, availability, recommendations, comparisons
+- marketing: Promotions, discounts, deals, loyalty program, coupon codes
+- technical_support: Troubleshooting, repairs, warranty, technical issues, setup help
+- order_logistics: Order tracking, shipping, returns, refunds, delivery questions
+- customer_service: General inquiries, store info, policies, feedback, account help
+
+Respond with ONLY the agent type and a confidence score between 0 and 1, separated by a comma.
+Example response: "sales, 0.95\""""
+
+# Tolerant parser for orchestrator output: matches "sales, 0.95" as well as
+# noisier variants like "sales (0.95)" or "Agent: sales, confidence=0.95"
+_CLASSIFICATION_RE = re.compile(
+    r"(sales|marketing|technical_support|order_logistics|customer_service)"
+    r"[^\d]*(0?\.\d+|1(?:\.0+)?)",
+    re.I
+)
+_CLASSIFICATION_LABEL_RE = re.compile(
+    r"(sales|marketing|technical_support|order_logistics|customer_service)",
+    re.I
+)
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with TTL for agent responses.
+    Avoids repeated Crew.kickoff() round-trips to OpenAI for identical queries.
+    """
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: int = 300):
+        """
+        Initialize query cache.
+
+        Args:
+            max_size: Maximum number of cached entries before LRU eviction
+            ttl_seconds: Time-to-live for each entry in seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Stats for observability
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a stable cache key from the given string parts"""
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get cached value for key, or None if missing or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, stored_at = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._cache[key]
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value in the cache, evicting the LRU entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif len(self._cache) >= self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+            self._cache[key] = (value, time.time())
+
+    def get_stats(self) -> dict:
+        """Get cache statistics for observability"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+
+class SemanticRouteCache:
+    """
+    Semantic cache for routing decisions.
+    Catches paraphrased queries ("where's my order" vs "track my package") that
+    the exact-match cache misses, by comparing message embeddings with cosine
+    similarity against previously classified messages.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_size: int = 2000):
+        """
+        Initialize semantic route cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum number of cached routing decisions
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_size = max_size
+        self._vectors: Optional[np.ndarray] = None  # (n, dim) normalized embeddings
+        self._routes: list[tuple[str, float]] = []
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _embed(self, message: str) -> Optional[np.ndarray]:
+        """Embed a message with the shared vector store embedding function"""
+        try:
+            from app.knowledge_base.vector_store import get_vector_store
+            embedding = get_vector_store().embedding_function([message])[0]
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return None
+            return vector / norm
+        except Exception as e:
+            logger.debug(f"Semantic cache embedding unavailable: {e}")
+            return None
+
+    def lookup(self, message: str) -> Optional[tuple[str, float]]:
+        """
+        Look up a cached routing decision for a semantically similar message.
+
+        Args:
+            message: User message
+
+        Returns:
+            Cached (agent_type, confidence) tuple or None
+        """
+        query_vector = self._embed(message)
+        if query_vector is None:
+            return None
+
+        with self._lock:
+            if self._vectors is None or len(self._routes) == 0:
+                self.misses += 1
+                return None
+
+            # Cosine similarity via dot product (vectors are normalized)
+            similarities = self._vectors @ query_vector
+            best_idx = int(np.argmax(similarities))
+
+            if similarities[best_idx] >= self.similarity_threshold:
+                self.hits += 1
+                return self._routes[best_idx]
+
+            self.misses += 1
+            return None
+
+    def insert(self, message: str, agent_type: str, confidence: float):
+        """
+        Store a routing decision for future semantic lookups.
+
+        Args:
+            message: User message
+            agent_type: Classified agent type
+            confidence: Classification confidence
+        """
+        vector = self._embed(message)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = vector[None, :]
+            else:
+                self._vectors = np.vstack([self._vectors, vector])
+            self._routes.append((agent_type, confidence))
+
+            # Evict oldest entries when over capacity
+            if len(self._routes) > self.max_size:
+                self._vectors = self._vectors[-self.max_size:]
+                self._routes = self._routes[-self.max_size:]
+
+
+class LocalIntentClassifier:
+    """
+    Local intent classifier that routes without an LLM call.
+    Embeds the message with the vector store's sentence-transformer and
+    compares it against per-agent prototype embeddings (mean of seed
+    phrases). Only routes when the softmax over similarities is confident;
+    ambiguous messages escalate to the orchestrator LLM.
+    """
+
+    SEED_PHRASES = {
+        "sales": [
+            "What's the price of this phone?",
+            "Is this laptop in stock?",
+            "Can you recommend a good TV?",
+            "Compare these two tablets for me",
+            "What are the specs of this model?",
+        ],
+        "marketing": [
+            "Are there any discounts right now?",
+            "Do you have a promo code?",
+            "How do I join the loyalty program?",
+            "What deals are running this week?",
+            "Can I get a coupon for accessories?",
+        ],
+        "technical_support": [
+            "My laptop won't turn on",
+            "How do I fix this error?",
+            "The screen is broken, can it be repaired?",
+            "Is this covered under warranty?",
+            "Help me set up my new device",
+        ],
+        "order_logistics": [
+            "Where is my order?",
+            "Track my package",
+            "I want to return this item",
+            "When will my delivery arrive?",
+            "How do I get a refund?",
+        ],
+        "customer_service": [
+            "What are your store hours?",
+            "Where is the nearest store?",
+            "I want to leave feedback",
+            "How do I reset my account password?",
+            "Do you price match?",
+        ],
+    }
+
+    def __init__(self, confidence_threshold: float = 0.7):
+        """
+        Initialize local intent classifier.
+
+        Args:
+            confidence_threshold: Minimum softmax probability to route locally
+        """
+        self.confidence_threshold = confidence_threshold
+        self._labels: list[str] = []
+        self._prototypes: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    def _embed(self, texts: list[str]) -> Optional[np.ndarray]:
+        """Embed texts with the shared vector store embedding function"""
+        try:
+            from app.knowledge_base.vector_store import get_vector_store
+            vectors = np.asarray(get_vector_store().embedding_function(texts), dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return vectors / norms
+        except Exception as e:
+            logger.debug(f"Local classifier embedding unavailable: {e}")
+            return None
+
+    def _ensure_prototypes(self) -> bool:
+        """Build per-agent prototype embeddings on first use"""
+        with self._lock:
+            if self._prototypes is not None:
+                return True
+
+            # Build into locals and publish atomically on success; a
+            # mid-build embed failure must not leave a partial label list
+            # behind to misalign with prototypes on the next attempt
+            labels = []
+            prototypes = []
+            for label, phrases in self.SEED_PHRASES.items():
+                vectors = self._embed(phrases)
+                if vectors is None:
+                    return False
+                prototype = vectors.mean(axis=0)
+                prototypes.append(prototype / np.linalg.norm(prototype))
+                labels.append(label)
+
+            self._labels = labels
+            self._prototypes = np.vstack(prototypes)
+            return True
+
+    def classify(self, message: str) -> Optional[tuple[str, float]]:
+        """
+        Classify a message locally.
+
+        Args:
+            message: User message
+
+        Returns:
+            Tuple of (agent_type, confidence) or None if not confident
+        """
+        if not self._ensure_prototypes():
+            return None
+
+        query = self._embed([message])
+        if query is None:
+            return None
+
+        similarities = self._prototypes @ query[0]
+
+        # Sharpened softmax over cosine similarities as a confidence proxy
+        logits = similarities * 10.0
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+
+        best_idx = int(np.argmax(probs))
+        confidence = float(probs[best_idx])
+
+        if confidence >= self.confidence_threshold:
+            return self._labels[best_idx], round(confidence, 3)
+
+        return None
+
+
+# Shared cache for classification and agent responses
+_query_cache = QueryCache()
+
+# Shared semantic cache for routing decisions
+_semantic_route_cache = SemanticRouteCache()
+
+# Shared local classifier used before falling back to the orchestrator LLM
+_local_intent_classifier = LocalIntentClassifier()
+
+
+def get_query_cache() -> QueryCache:
+    """
+    Get the shared query cache instance.
+
+    Returns:
+        QueryCache: Global query cache
+    """
+    return _query_cache
+
+
+@functools.lru_cache(maxsize=8)
+def _get_llm(model: str, temperature: float) -> ChatOpenAI:
+    """
+    Get a shared ChatOpenAI client for (model, temperature).
+    Clients are cached at module level so coordinators share one HTTP
+    connection pool and tokenizer cache instead of building their own.
+
+    When OPENAI_BASE_URL points at a server with automatic prefix caching
+    (e.g. vLLM), the static agent backstories are served from the KV-cache
+    instead of being re-prefilled on every call.
+    """
+    kwargs = {
+        "model": model,
+        "temperature": temperature,
+        "openai_api_key": settings.OPENAI_API_KEY
+    }
+    if settings.OPENAI_BASE_URL:
+        kwargs["base_url"] = settings.OPENAI_BASE_URL
+    return ChatOpenAI(**kwargs)
+
+
 class AgentFactory:
-    """Factory class for creating CrewAI agents"""
+    """
+    Factory class for creating CrewAI agents.
+
+    Prompt-ordering invariant: each agent's backstory is static and forms
+    the strict prefix of every prompt, with the per-request message appended
+    after it. Keep it that way — prefix-caching backends can only reuse the
+    KV-cache for a prefix that is byte-identical across requests.
+    """
 
     def __init__(self):
         """Initialize LLM instances for agents"""
         # Orchestrator uses lower temperature for more deterministic routing
-        self.orchestrator_llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=settings.ORCHESTRATOR_TEMPERATURE,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        self.orchestrator_llm = _get_llm(settings.OPENAI_MODEL, settings.ORCHESTRATOR_TEMPERATURE)
 
         # Sub-agents use higher temperature for more creative responses
-        self.agent_llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=settings.SUB_AGENT_TEMPERATURE,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        self.agent_llm = _get_llm(settings.OPENAI_MODEL, settings.SUB_AGENT_TEMPERATURE)
 
     def create_orchestrator_agent(self) -> Agent:
         """
         Create the orchestrator agent (router).
         Routes customer inquiries to appropriate specialized agents.
         """
+        # Backstory is intentionally short: the orchestrator only emits a
+        # label + confidence, so every extra prompt token is wasted prefill
         return Agent(
             role="Orchestrator Agent",
-            goal="Analyze customer inquiries and route them to the most appropriate specialized agent based on intent and context",
-            backstory="""You are the primary routing agent for ElectroMart's customer service system.
-                Your expertise lies in understanding customer intent and determining which specialized agent
-                can best handle their request. You excel at:
-                - Intent classification (sales, support, orders, marketing, general service)
-                - Context analysis from conversation history
-                - Identifying urgent or complex cases that may need multiple agents
-                - Providing seamless handoffs between agents when topics change
-
-                You work with 5 specialized agents:
-                1. Sales Agent - Product inquiries, pricing, availability, recommendations
-                2. Marketing/Promotions Agent - Deals, discounts, loyalty programs, campaigns
-                3. Technical Support Agent - Troubleshooting, repairs, warranty, technical specs
-                4. Order & Logistics Agent - Order tracking, shipping, returns, refunds
-                5. Customer Service Agent - General inquiries, store info, feedback, policies
-
-                Your routing decisions should be confident and accurate, with >85% classification accuracy.""",
+            goal="Route customer messages to the most appropriate specialized agent",
+            backstory="""You route ElectroMart customer messages to one of 5 agents:
+                sales, marketing, technical_support, order_logistics, customer_service.
+                Output only '<label>, <confidence 0-1>'.""",
             llm=self.orchestrator_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False,
             max_iter=3
         )
@@ -85,7 +459,7 @@ class AgentFactory:
                 accurate, up-to-date information.""",
             tools=[product_search_tool, promotion_search_tool],
             llm=self.agent_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False
         )
 
@@ -117,7 +491,7 @@ class AgentFactory:
                 You use your tools to find relevant promotions based on customer interest.""",
             tools=[promotion_search_tool, product_search_tool],
             llm=self.agent_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False
         )
 
@@ -150,7 +524,7 @@ class AgentFactory:
                 and warranty information to provide accurate assistance.""",
             tools=[knowledge_base_search_tool, product_search_tool],
             llm=self.agent_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False
         )
 
@@ -184,7 +558,7 @@ class AgentFactory:
                 search knowledge bases for return and shipping policies.""",
             tools=[order_lookup_tool, knowledge_base_search_tool],
             llm=self.agent_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False
         )
 
@@ -218,7 +592,7 @@ class AgentFactory:
                 to provide accurate information.""",
             tools=[knowledge_base_search_tool, promotion_search_tool],
             llm=self.agent_llm,
-            verbose=True,
+            verbose=settings.DEBUG,
             allow_delegation=False
         )
 
@@ -229,89 +603,279 @@ class AgentCoordinator:
     Routes customer queries to appropriate agents and manages responses.
     """
 
+    # Compiled keyword patterns for the local routing fast path.
+    # High-confidence matches skip the orchestrator LLM entirely.
+    INTENT_PATTERNS = {
+        "sales": re.compile(
+            r"\b(price|pricing|cost|buy|purchase|recommend|recommendation|compare|comparison|"
+            r"in\s*stock|availab\w+|spec|specs|specification|product|model|cheap\w*|budget)\b", re.I),
+        "marketing": re.compile(
+            r"\b(promo\w*|discount|coupon|deal|deals|sale|offer|voucher|loyalty|rewards?|"
+            r"campaign|code)\b", re.I),
+        "technical_support": re.compile(
+            r"\b(troubleshoot\w*|repair|warranty|broken|not\s+working|fix|error|crash\w*|"
+            r"setup|install\w*|reset|malfunction\w*|defect\w*)\b", re.I),
+        "order_logistics": re.compile(
+            r"\b(track|tracking|order\s*#?\w*|refund|return\w*|ship\w*|deliver\w*|package|"
+            r"exchange|cancel\w*)\b", re.I),
+        "customer_service": re.compile(
+            r"\b(store\s+hours?|location|address|feedback|complaint|policy|policies|account|"
+            r"password|contact|price\s+match\w*)\b", re.I),
+    }
+
     def __init__(self):
-        """Initialize agent coordinator with all agents"""
+        """Initialize agent coordinator with lazy agent construction"""
         self.factory = AgentFactory()
 
-        # Create all agents
-        self.orchestrator = self.factory.create_orchestrator_agent()
-        self.sales_agent = self.factory.create_sales_agent()
-        self.marketing_agent = self.factory.create_marketing_agent()
-        self.technical_support_agent = self.factory.create_technical_support_agent()
-        self.order_logistics_agent = self.factory.create_order_logistics_agent()
-        self.customer_service_agent = self.factory.create_customer_service_agent()
-
-        # Agent mapping for routing
-        self.agent_map = {
-            "sales": self.sales_agent,
-            "marketing": self.marketing_agent,
-            "technical_support": self.technical_support_agent,
-            "order_logistics": self.order_logistics_agent,
-            "customer_service": self.customer_service_agent
+        # Agents are built on first use so a worker only pays for the
+        # specialists its traffic actually needs
+        self._agent_builders = {
+            "sales": self.factory.create_sales_agent,
+            "marketing": self.factory.create_marketing_agent,
+            "technical_support": self.factory.create_technical_support_agent,
+            "order_logistics": self.factory.create_order_logistics_agent,
+            "customer_service": self.factory.create_customer_service_agent
         }
+        self._agents: dict[str, Agent] = {}
+        self._orchestrator: Optional[Agent] = None
+
+        # Reusable crews with a placeholder task, rebuilt descriptions per
+        # request. A crew is not reentrant, so each carries its own lock.
+        self._crews: dict[str, tuple[Crew, threading.Lock]] = {}
+
+        # In-flight speculative retrievals keyed by (agent, message).
+        # Mutated from executor threads, so access goes through the lock;
+        # insertion order doubles as LRU order for overflow eviction
+        self._speculative: OrderedDict = OrderedDict()
+        self._speculative_lock = threading.Lock()
+
+        logger.info("Agent coordinator initialized (agents built lazily)")
+
+    @property
+    def orchestrator(self) -> Agent:
+        """Get the orchestrator agent, building it on first access"""
+        if self._orchestrator is None:
+            self._orchestrator = self.factory.create_orchestrator_agent()
+        return self._orchestrator
+
+    @property
+    def agent_map(self) -> dict:
+        """Mapping of agent type to builder, used for routing validation"""
+        return self._agent_builders
+
+    def _get_agent(self, agent_type: str) -> Optional[Agent]:
+        """
+        Get a specialized agent by type, building and caching it on first use.
 
-        logger.info("Agent coordinator initialized with all agents")
+        Args:
+            agent_type: Type of agent to get
 
-    def classify_intent(self, message: str, conversation_context: str = "") -> tuple[str, float]:
+        Returns:
+            Agent instance or None for unknown types
         """
-        Use orchestrator to classify intent and determine which agent to use.
+        if agent_type not in self._agent_builders:
+            return None
+        if agent_type not in self._agents:
+            self._agents[agent_type] = self._agent_builders[agent_type]()
+        return self._agents[agent_type]
+
+    def _get_crew(self, crew_key: str, agent: Agent, expected_output: str) -> tuple[Crew, threading.Lock]:
+        """
+        Get a reusable single-agent crew, building it on first use.
+        Reusing the crew keeps Task/Crew construction and validation out of
+        the request path; callers must hold the returned lock while running.
+
+        Args:
+            crew_key: Cache key for the crew (agent type or 'orchestrator')
+            agent: Agent the crew runs
+            expected_output: Expected output description for the crew's task
+
+        Returns:
+            Tuple of (crew, lock)
+        """
+        if crew_key not in self._crews:
+            task = Task(
+                description="PLACEHOLDER",
+                agent=agent,
+                expected_output=expected_output
+            )
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                verbose=False
+            )
+            self._crews[crew_key] = (crew, threading.Lock())
+        return self._crews[crew_key]
+
+    # Retrieval that can be fired speculatively while the orchestrator
+    # classifies; only agents whose first tool call needs nothing beyond
+    # the raw message are eligible
+    SPECULATIVE_RETRIEVERS = {
+        "sales": lambda message: product_search_func(message),
+        "marketing": lambda message: promotion_search_func(message),
+        "technical_support": lambda message: knowledge_base_search_func(message, "technical_support"),
+    }
+
+    def _rank_by_keywords(self, message: str) -> list[tuple[str, int]]:
+        """Score message against each agent's keyword pattern, best first"""
+        scores = {
+            agent_type: len(pattern.findall(message))
+            for agent_type, pattern in self.INTENT_PATTERNS.items()
+        }
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def _classify_by_keywords(self, message: str) -> Optional[tuple[str, float]]:
+        """
+        Resolve unambiguous intents locally with keyword patterns.
 
         Args:
             message: User message
-            conversation_context: Previous conversation context
 
         Returns:
-            Tuple of (agent_type, confidence_score)
+            Tuple of (agent_type, confidence) or None if ambiguous
         """
-        try:
-            # Create classification task
-            context_section = f"\n\nConversation Context:\n{conversation_context}" if conversation_context else ""
+        ranked = self._rank_by_keywords(message)
+        top_agent, top_score = ranked[0]
+        runner_up_score = ranked[1][1]
 
-            classification_task = Task(
-                description=f"""Analyze the following customer message and determine which specialized agent
-                    should handle it. Consider the conversation context if provided.
+        # Require a clear winner before skipping the LLM
+        if top_score >= 2 and top_score - runner_up_score >= 1:
+            return top_agent, 0.9
 
-                    Customer Message: "{message}"{context_section}
+        return None
 
-                    Available agents:
-                    - sales: Product inquiries, pricing, availability, recommendations, comparisons
-                    - marketing: Promotions, discounts, deals, loyalty program, coupon codes
-                    - technical_support: Troubleshooting, repairs, warranty, technical issues, setup help
-                    - order_logistics: Order tracking, shipping, returns, refunds, delivery questions
-                    - customer_service: General inquiries, store info, policies, feedback, account help
+    def _speculate_retrieval(self, message: str):
+        """
+        Fire a speculative tool search for the most likely agent while the
+        orchestrator LLM classifies, overlapping retrieval with inference.
 
-                    Respond with ONLY the agent type (sales, marketing, technical_support, order_logistics, or customer_service)
-                    and a confidence score between 0 and 1, separated by a comma.
+        Args:
+            message: User message
+        """
+        likely_agent, score = self._rank_by_keywords(message)[0]
+        retriever = self.SPECULATIVE_RETRIEVERS.get(likely_agent)
+        if score < 1 or retriever is None:
+            return
+
+        key = _query_cache.make_key("speculate", likely_agent, message)
+        future = submit_search(retriever, message)
+        with self._speculative_lock:
+            # Evict the oldest speculation at capacity rather than
+            # clearing the dict out from under concurrent requests
+            while len(self._speculative) >= 100:
+                self._speculative.popitem(last=False)
+            self._speculative[key] = future
+
+    def _take_speculative_result(
+        self,
+        agent_type: str,
+        message: str,
+        block: bool = True
+    ) -> Optional[str]:
+        """
+        Collect a speculative retrieval result if one matches this request.
 
-                    Example response: "sales, 0.95" """,
-                agent=self.orchestrator,
-                expected_output="Agent type and confidence score (e.g., 'sales, 0.95')"
-            )
+        Args:
+            agent_type: Agent chosen by classification
+            message: User message
+            block: Wait for an unfinished speculation. Only safe from
+                executor threads — coroutines must pass False so a slow
+                retrieval can't stall the event loop
 
-            # Create crew for classification
-            crew = Crew(
-                agents=[self.orchestrator],
-                tasks=[classification_task],
-                verbose=False
-            )
+        Returns:
+            Pre-fetched tool output or None
+        """
+        key = _query_cache.make_key("speculate", agent_type, message)
+        with self._speculative_lock:
+            future = self._speculative.pop(key, None)
+
+        if future is None:
+            return None
+        if not block and not future.done():
+            # Discard the speculation rather than wait on it; the agent
+            # will run its own retrieval instead
+            return None
+        try:
+            return future.result(timeout=10)
+        except Exception as e:
+            logger.debug(f"Speculative retrieval failed: {e}")
+            return None
 
-            # Execute classification
-            result = crew.kickoff()
+    def classify_intent(self, message: str, conversation_context: str = "") -> tuple[str, float]:
+        """
+        Use orchestrator to classify intent and determine which agent to use.
+
+        Args:
+            message: User message
+            conversation_context: Previous conversation context
 
-            # Parse result
-            result_text = str(result).strip().lower()
-            parts = result_text.split(',')
+        Returns:
+            Tuple of (agent_type, confidence_score)
+        """
+        try:
+            # Check cache for identical (message, context) pairs
+            cache_key = _query_cache.make_key("classify", message, conversation_context)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Classification cache hit: {cached[0]}")
+                return cached
+
+            # Try local keyword fast path before any LLM call
+            keyword_match = self._classify_by_keywords(message)
+            if keyword_match is not None:
+                logger.info(f"Intent classified by keyword fast path: {keyword_match[0]}")
+                return keyword_match
+
+            # Check semantic cache for paraphrased messages
+            # (only without context, which can change the routing of follow-ups)
+            if not conversation_context:
+                semantic_hit = _semantic_route_cache.lookup(message)
+                if semantic_hit is not None:
+                    logger.debug(f"Semantic route cache hit: {semantic_hit[0]}")
+                    return semantic_hit
+
+            # Try the local classifier before paying for an LLM round-trip
+            # (skipped with context, which the local model can't weigh)
+            if not conversation_context:
+                local_result = _local_intent_classifier.classify(message)
+                if local_result is not None:
+                    logger.info(f"Intent classified locally: {local_result[0]} (confidence: {local_result[1]})")
+                    return local_result
+
+            # Overlap retrieval for the most likely agent with classification
+            self._speculate_retrieval(message)
+
+            # Build classification message
+            context_section = f"\n\nConversation Context:\n{conversation_context}" if conversation_context else ""
 
-            if len(parts) >= 2:
-                agent_type = parts[0].strip()
-                try:
-                    confidence = float(parts[1].strip())
-                except ValueError:
+            # Classification needs no tools, so invoke the LLM directly and
+            # skip the Crew/Task scheduling overhead entirely
+            result = self.factory.orchestrator_llm.invoke([
+                SystemMessage(content=_ORCHESTRATOR_SYSTEM_PROMPT),
+                HumanMessage(content=f'Customer Message: "{message}"{context_section}')
+            ])
+
+            # Parse result, tolerating the LLM's formatting variance
+            result_text = str(result.content).strip().lower()
+            match = _CLASSIFICATION_RE.search(result_text)
+            if match:
+                agent_type = match.group(1)
+                confidence = float(match.group(2))
+            else:
+                # Label without a usable number still beats a re-route
+                match = _CLASSIFICATION_LABEL_RE.search(result_text)
+                if match:
+                    agent_type = match.group(1)
                     confidence = 0.8  # Default confidence
 
+            if match:
+
                 # Validate agent type
                 if agent_type in self.agent_map:
                     logger.info(f"Intent classified: {agent_type} (confidence: {confidence})")
+                    _query_cache.set(cache_key, (agent_type, confidence))
+                    if not conversation_context:
+                        _semantic_route_cache.insert(message, agent_type, confidence)
                     return agent_type, confidence
 
             # Fallback to customer service
@@ -340,19 +904,165 @@ class AgentCoordinator:
             Agent response
         """
         try:
-            agent = self.agent_map.get(agent_type)
+            agent = self._get_agent(agent_type)
             if not agent:
                 logger.error(f"Agent type '{agent_type}' not found")
                 return "I apologize, but I'm having trouble processing your request. Please try again."
 
+            # Check cache for identical (agent, message, context) requests
+            cache_key = _query_cache.make_key("process", agent_type, message, conversation_context)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Response cache hit for agent {agent_type}")
+                return cached
+
             # Create context section
             context_section = f"\n\nPrevious conversation context:\n{conversation_context}" if conversation_context else ""
 
+            # Reuse speculative retrieval fired during classification
+            prefetched = self._take_speculative_result(agent_type, message)
+            prefetched_section = (
+                f"\n\nPre-fetched search results (already retrieved, use instead of searching again):\n{prefetched}"
+                if prefetched else ""
+            )
+
+            task_description = f"""Handle the following customer inquiry:
+
+                    Customer Message: "{message}"{context_section}{prefetched_section}
+
+                    Provide a helpful, accurate, and professional response. Use your tools to search for
+                    relevant information when needed. Keep your response concise but complete."""
+
+            # Execute task on the reusable crew for this agent
+            crew, crew_lock = self._get_crew(
+                agent_type,
+                agent,
+                expected_output="Helpful response to customer inquiry"
+            )
+            with crew_lock:
+                crew.tasks[0].description = task_description
+                result = crew.kickoff()
+
+            logger.info(f"Agent {agent_type} processed message successfully")
+            response = str(result)
+            _query_cache.set(cache_key, response)
+            return response
+
+        except Exception as e:
+            logger.error(f"Error processing with agent {agent_type}: {e}")
+            return "I apologize, but I encountered an error processing your request. Please try again or rephrase your question."
+
+    async def process_with_agent_stream(
+            self,
+            agent_type: str,
+            message: str,
+            conversation_context: str = ""
+    ):
+        """
+        Stream a specialist response token by token.
+        Talks to the LLM directly (tools are not available mid-stream), so
+        any speculative retrieval results are injected as context instead.
+        Cuts time-to-first-token to roughly the prefill time.
+
+        Args:
+            agent_type: Type of agent to use
+            message: User message
+            conversation_context: Previous conversation context
+
+        Yields:
+            Response text chunks
+        """
+        try:
+            agent = self._get_agent(agent_type)
+            if not agent:
+                logger.error(f"Agent type '{agent_type}' not found")
+                yield "I apologize, but I'm having trouble processing your request. Please try again."
+                return
+
+            # Serve full cached responses immediately
+            cache_key = _query_cache.make_key("process", agent_type, message, conversation_context)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Response cache hit for agent {agent_type}")
+                yield cached
+                return
+
+            context_section = f"\n\nPrevious conversation context:\n{conversation_context}" if conversation_context else ""
+
+            # Non-blocking: a still-running speculation must not stall
+            # the event loop this coroutine shares
+            prefetched = self._take_speculative_result(agent_type, message, block=False)
+            prefetched_section = (
+                f"\n\nRelevant search results:\n{prefetched}" if prefetched else ""
+            )
+
+            messages = [
+                SystemMessage(content=f"{agent.role}. {agent.backstory}"),
+                HumanMessage(content=f'Customer Message: "{message}"{context_section}{prefetched_section}')
+            ]
+
+            chunks = []
+            async for chunk in self.factory.agent_llm.astream(messages):
+                content = chunk.content
+                if content:
+                    chunks.append(content)
+                    yield content
+
+            logger.info(f"Agent {agent_type} streamed response successfully")
+            _query_cache.set(cache_key, "".join(chunks))
+
+        except Exception as e:
+            logger.error(f"Error streaming with agent {agent_type}: {e}")
+            yield "I apologize, but I encountered an error processing your request. Please try again or rephrase your question."
+
+    async def process_with_agent_async(
+            self,
+            agent_type: str,
+            message: str,
+            conversation_context: str = ""
+    ) -> str:
+        """
+        Async variant of process_with_agent.
+        Uses Crew.kickoff_async so one worker can overlap many concurrent
+        sessions instead of blocking on each OpenAI round-trip.
+
+        Args:
+            agent_type: Type of agent to use
+            message: User message
+            conversation_context: Previous conversation context
+
+        Returns:
+            Agent response
+        """
+        try:
+            agent = self._get_agent(agent_type)
+            if not agent:
+                logger.error(f"Agent type '{agent_type}' not found")
+                return "I apologize, but I'm having trouble processing your request. Please try again."
+
+            # Check cache for identical (agent, message, context) requests
+            cache_key = _query_cache.make_key("process", agent_type, message, conversation_context)
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Response cache hit for agent {agent_type}")
+                return cached
+
+            # Create context section
+            context_section = f"\n\nPrevious conversation context:\n{conversation_context}" if conversation_context else ""
+
+            # Reuse speculative retrieval fired during classification;
+            # non-blocking so an unfinished one can't stall the event loop
+            prefetched = self._take_speculative_result(agent_type, message, block=False)
+            prefetched_section = (
+                f"\n\nPre-fetched search results (already retrieved, use instead of searching again):\n{prefetched}"
+                if prefetched else ""
+            )
+
             # Create task for the specialized agent
             task = Task(
                 description=f"""Handle the following customer inquiry:
 
-                    Customer Message: "{message}"{context_section}
+                    Customer Message: "{message}"{context_section}{prefetched_section}
 
                     Provide a helpful, accurate, and professional response. Use your tools to search for
                     relevant information when needed. Keep your response concise but complete.""",
@@ -367,11 +1077,13 @@ class AgentCoordinator:
                 verbose=False
             )
 
-            # Execute task
-            result = crew.kickoff()
+            # Execute task without blocking the event loop
+            result = await crew.kickoff_async()
 
             logger.info(f"Agent {agent_type} processed message successfully")
-            return str(result)
+            response = str(result)
+            _query_cache.set(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error processing with agent {agent_type}: {e}")
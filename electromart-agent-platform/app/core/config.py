@@ -19,9 +19,16 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Uvicorn worker count. Conversation state is per-process, so values
+    # above 1 need sticky sessions (or a shared session store) in front —
+    # otherwise follow-up requests land on workers with no history
+    WORKERS: int = 1
 
     # OpenAI Configuration
     OPENAI_API_KEY: str
+    # Optional OpenAI-compatible endpoint (e.g. a self-hosted vLLM server
+    # with automatic prefix caching for the static agent backstories)
+    OPENAI_BASE_URL: Optional[str] = None
     OPENAI_MODEL: str = "gpt-3.5-turbo"
     OPENAI_TEMPERATURE: float = 0.7
     OPENAI_MAX_TOKENS: int = 2000
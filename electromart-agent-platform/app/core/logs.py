@@ -16,6 +16,8 @@ def configure_logging():
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level= settings.LOG_LEVEL,
         colorize=True,
+        #Hand records to the background writer thread instead of blocking
+        enqueue=True,
     )
 
     #Add file handler with rotation
@@ -31,6 +33,8 @@ def configure_logging():
         compression="zip",
         #Thread safe loggin
         enqueue=True,
+        #Never let a sink error take down the request path
+        catch=True,
     )
 
     logger.info("Logging configured")
@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
 from app.core.logs import get_logger
@@ -12,14 +14,64 @@ logger = get_logger()
 DATA_DIR = Path(settings.DATABASE_URL.split("///")[-1]).parent
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-# Create async engine
+# SQLite is effectively single-writer, so the engines are split: all
+# writes funnel through the batching queue on this engine while request
+# handlers read through a pool of query_only connections below. echo is
+# kept off even in DEBUG — per-statement Python logging is a measurable
+# cost on the chat path.
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=False,
     future=True,
 )
 
-# Create async session factory
+# Read engine: small pool whose connections can never take the write
+# lock, so reads are served from the WAL/page cache without contending
+# with the writer. The overflow allowance absorbs bursts of gathered
+# reads (the analytics endpoint fans out concurrently) without queueing
+# them behind the fixed pool.
+read_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=8,
+    max_overflow=8,
+)
+
+_COMMON_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "busy_timeout=5000",
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """
+    Tune SQLite for a concurrent service.
+    WAL lets readers run alongside a writer and turns commits into log
+    appends; synchronous=NORMAL skips the per-commit journal fsync that
+    the default (FULL + journal_mode=delete) pays on every insert.
+    """
+    cursor = dbapi_conn.cursor()
+    for pragma in _COMMON_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def _set_sqlite_read_pragmas(dbapi_conn, _connection_record):
+    """Same tuning as the write engine, plus query_only to forbid writes"""
+    cursor = dbapi_conn.cursor()
+    for pragma in _COMMON_PRAGMAS + ("query_only=1",):
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -28,19 +80,28 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncSession:
     """
-    Dependency function to get database session.
-    Ensures proper session lifecycle with automatic cleanup.
+    Dependency function to get a read-only database session.
+    Request handlers only query; writes go through the batching queue on
+    the write engine, so handing out query_only connections here keeps
+    reads off the write lock entirely.
 
     Yields:
-        AsyncSession: Database session
+        AsyncSession: Read-only database session
     """
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception as e:
             await session.rollback()
             logger.error(f"Database session error: {e}")
@@ -49,6 +110,39 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+@asynccontextmanager
+async def session_scope(session: Optional[AsyncSession] = None, readonly: bool = False):
+    """
+    Yield a database session for a unit of work.
+    When a request-scoped session is passed in (from the get_db dependency),
+    it is reused and commit is left to the dependency; otherwise a new
+    session is opened — from the read-only pool for readonly work, from
+    the write engine (with a commit) otherwise. Lets services share one
+    session per request instead of opening their own for every call.
+
+    Args:
+        session: Existing session to reuse, or None to open a new one
+        readonly: Open from the query_only read pool and skip the commit
+
+    Yields:
+        AsyncSession: Database session
+    """
+    if session is not None:
+        yield session
+        return
+
+    factory = ReadSessionLocal if readonly else AsyncSessionLocal
+    async with factory() as new_session:
+        try:
+            yield new_session
+            if not readonly:
+                await new_session.commit()
+        except Exception as e:
+            await new_session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+
+
 async def init_db():
     """
     Initialize database by creating all tables.
@@ -70,6 +164,7 @@ async def close_db():
     """
     try:
         await engine.dispose()
+        await read_engine.dispose()
         logger.info("Database connections closed successfully")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
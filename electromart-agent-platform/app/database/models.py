@@ -1,15 +1,53 @@
-from sqlalchemy import Column, Integer, DateTime, String, func, Text, Float, JSON, Boolean
+import json
+
+from sqlalchemy import Column, Integer, DateTime, String, func, Text, Float, Index, Boolean, TypeDecorator
 from sqlalchemy.orm import declarative_base
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
 Base = declarative_base()
 
 
+class OrjsonJSON(TypeDecorator):
+    """
+    JSON column backed by orjson for fast (de)serialization.
+    Metadata dicts are written on every message, so the stdlib json
+    round-trip inside SQLAlchemy's type dispatch is on the hot path.
+    Falls back to stdlib json if orjson is unavailable.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if orjson is not None:
+            return orjson.dumps(value).decode()
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if orjson is not None:
+            return orjson.loads(value)
+        return json.loads(value)
+
+
 class ConversationHistory(Base):
     """
     Stores conversation history for context management and analytics.
     """
     __tablename__ = "conversation_history"
 
+    # Context fetches run WHERE session_id=? ORDER BY timestamp DESC LIMIT N;
+    # the composite index turns the post-lookup sort into a range scan
+    __table_args__ = (
+        Index("ix_conv_session_ts", "session_id", "timestamp"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     session_id = Column(String(255), index=True, nullable=False)
     timestamp = Column(DateTime, default=func.now(), nullable=False)
@@ -21,7 +59,7 @@ class ConversationHistory(Base):
     sentiment_score = Column(Float)
     sentiment_label = Column(String(50))  # positive, negative, neutral
     response_time_ms = Column(Integer)  # Response time in milliseconds
-    extra_metadata = Column(JSON)  # Additional context data
+    extra_metadata = Column(OrjsonJSON)  # Additional context data
 
 
 class AgentAnalytics(Base):
@@ -30,6 +68,12 @@ class AgentAnalytics(Base):
     """
     __tablename__ = "agent_analytics"
 
+    # Dashboard aggregations filter on a timestamp window and group by
+    # agent_type; the composite index keeps those scans off the heap
+    __table_args__ = (
+        Index("ix_analytics_ts_agent", "timestamp", "agent_type"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     timestamp = Column(DateTime, default=func.now(), nullable=False)
     agent_type = Column(String(100), nullable=False)
@@ -39,7 +83,7 @@ class AgentAnalytics(Base):
     tokens_used = Column(Integer)
     error_message = Column(Text, nullable=True)
     user_feedback = Column(Integer, nullable=True)  # 1-5 rating
-    extra_metadata = Column(JSON)
+    extra_metadata = Column(OrjsonJSON)
 
 
 class SupportTicket(Base):
@@ -48,6 +92,11 @@ class SupportTicket(Base):
     """
     __tablename__ = "support_tickets"
 
+    # Per-session ticket listings filter on session_id and sort by created_at
+    __table_args__ = (
+        Index("ix_ticket_session_created", "session_id", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     ticket_id = Column(String(100), unique=True, index=True, nullable=False)
     session_id = Column(String(255), index=True, nullable=False)
@@ -60,7 +109,7 @@ class SupportTicket(Base):
     description = Column(Text, nullable=False)
     resolution = Column(Text, nullable=True)
     assigned_agent = Column(String(100))
-    extra_metadata = Column(JSON)
+    extra_metadata = Column(OrjsonJSON)
 
 
 class ReturnRequest(Base):
@@ -79,7 +128,7 @@ class ReturnRequest(Base):
     status = Column(String(50), default="pending")  # pending, approved, rejected, completed
     refund_amount = Column(Float)
     notes = Column(Text)
-    extra_metadata = Column(JSON)
+    extra_metadata = Column(OrjsonJSON)
 
 
 class UserFeedback(Base):
@@ -95,4 +144,4 @@ class UserFeedback(Base):
     feedback_text = Column(Text)
     agent_type = Column(String(100), nullable=False)
     helpful = Column(Boolean)
-    extra_metadata = Column(JSON)
+    extra_metadata = Column(OrjsonJSON)
@@ -3,11 +3,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import router
+from fastapi.responses import ORJSONResponse
+from app.api.routes import (
+    router,
+    start_sentiment_executor,
+    start_session_cleanup,
+    stop_sentiment_executor,
+    stop_session_cleanup,
+    start_vector_status_monitor,
+    stop_vector_status_monitor,
+)
 from app.core.config import settings
 from app.core.logs import get_logger
 from app.database.database import init_db, close_db
 from app.knowledge_base.vector_store import initialize_vector_store
+from app.services.write_queue import get_write_queue
 
 logger = get_logger()
 
@@ -30,6 +40,20 @@ async def lifespan(app: FastAPI):
         initialize_vector_store()
         logger.info("Vector store initialized")
 
+        # Start background batching writer
+        await get_write_queue().start()
+        logger.info("Write queue started")
+
+        # Keep /health cheap by refreshing vector store status off-path
+        start_vector_status_monitor()
+
+        # Sentiment analysis runs in pinned worker processes so the
+        # GIL-holding analyzer passes don't serialize concurrent requests
+        start_sentiment_executor()
+
+        # Sweep expired sessions on a timer rather than per request
+        start_session_cleanup()
+
         logger.info("✅ System started successfully")
 
     except Exception as e:
@@ -41,6 +65,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down...")
     try:
+        stop_session_cleanup()
+        stop_sentiment_executor()
+        stop_vector_status_monitor()
+        await get_write_queue().stop()
         await close_db()
         logger.info("Database connections closed")
     except Exception as e:
@@ -52,7 +80,9 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Multi-Agent Voice System for Electronic Consumer Store",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes responses several times faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -89,5 +119,14 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        # uvloop and httptools (bundled with uvicorn[standard]) beat the
+        # default asyncio loop and h11 parser under concurrent streams
+        loop="uvloop",
+        http="httptools",
+        # Single worker by default: conversation state lives per-process,
+        # so scaling out via WORKERS requires sticky sessions in front.
+        # Each worker gets its own vector store since the Chroma client
+        # is not multiprocess-safe.
+        workers=1 if settings.DEBUG else settings.WORKERS,
     )
@@ -1,7 +1,33 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
+
+__all__ = [
+    "MessageRole",
+    "AgentType",
+    "SentimentLabel",
+    "ChatRequest",
+    "VoiceRequest",
+    "FeedbackRequest",
+    "AgentInfo",
+    "SentimentInfo",
+    "ChatResponse",
+    "ConversationMessage",
+    "ConversationHistory",
+    "ProductSpecs",
+    "Product",
+    "OrderItem",
+    "Order",
+    "Promotion",
+    "AgentPerformance",
+    "SystemAnalytics",
+    "SupportTicketCreate",
+    "SupportTicketResponse",
+    "ReturnRequestCreate",
+    "ReturnRequestResponse",
+    "HealthCheck",
+]
 
 
 class MessageRole(str, Enum):
@@ -33,14 +59,18 @@ class ChatRequest(BaseModel):
     session_id: Optional[str] = Field(None, description="Session ID for conversation continuity")
     channel_id: bool = Field(False, description="Whether input is from voice")
 
-    class Config:
-        json_schema_extra = {
+    # frozen skips the assignment-validation machinery pydantic otherwise
+    # attaches per instance; requests are never mutated after parsing
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "message": "What's the price of iPhone 15 Pro?",
                 "session_id": "session_123456",
                 "voice_input": False,
             }
-        }
+        },
+    )
 
 class VoiceRequest(BaseModel):
     """Request schema for voice endpoint"""
@@ -69,11 +99,15 @@ class AgentInfo(BaseModel):
     agent_type: AgentType
     confidence: float = Field(...,ge=0.0, le=1.0, description="Confidence score")
 
+    model_config = ConfigDict(frozen=True)
+
 class SentimentInfo(BaseModel):
     """Sentiment analysis information"""
     label: SentimentLabel
     score: float = Field(..., ge=-1.0, le=1.0, description="Sentiment score")
 
+    model_config = ConfigDict(frozen=True)
+
 class ChatResponse(BaseModel):
     """Response schema for chat endpoint"""
     response: str = Field(..., description="Agent response message")
@@ -84,8 +118,9 @@ class ChatResponse(BaseModel):
     timestamp: datetime
     suggestions: Optional[List[str]] = Field(None, description="Suggested follow-up questions")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "response": "The iPhone 15 Pro is proces at $999.99...",
                 "session_id": "session_123456",
@@ -101,7 +136,8 @@ class ChatResponse(BaseModel):
                 "timestamp": "2025-01-25T10:30:00",
                 "suggestions": ["Compare with Samsung Galaxy S24","Check availability"]
             }
-        }
+        },
+    )
 
 class ConversationMessage(BaseModel):
     """Single Message schema in conversation history"""
@@ -110,6 +146,8 @@ class ConversationMessage(BaseModel):
     timestamp: datetime
     agent_type: Optional[AgentType] = None
 
+    model_config = ConfigDict(frozen=True)
+
 class ConversationHistory(BaseModel):
     """Conversation History Response"""
     session_id: str
@@ -1,13 +1,16 @@
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
-from sqlalchemy import func, select, Integer
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.logs import get_logger
-from app.database.database import get_db
+from app.database.database import session_scope
 from app.database.models import ConversationHistory, AgentAnalytics
+from app.services.write_queue import get_write_queue
 
 logger = get_logger()
 
@@ -18,6 +21,28 @@ class AnalyticsService:
     Records detailed analytics for each agent interaction.
     """
 
+    # Aggregate results are served from a short-lived cache: dashboards
+    # poll these endpoints every few seconds, and a minute of staleness
+    # is invisible on day-scale windows while taking nearly every poll
+    # off the database
+    _AGG_TTL_SECONDS = 60.0
+
+    def __init__(self):
+        # (metric, days) -> (computed_at, result)
+        self._agg_cache: Dict[tuple, tuple] = {}
+
+    def _cached_agg(self, key: tuple) -> Optional[Any]:
+        """Return a cached aggregate if it is still fresh"""
+        entry = self._agg_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self._AGG_TTL_SECONDS:
+            return entry[1]
+        return None
+
+    def _store_agg(self, key: tuple, value: Any) -> Any:
+        """Cache an aggregate result and return it"""
+        self._agg_cache[key] = (time.monotonic(), value)
+        return value
+
     async def track_agent_performance(
         self,
         agent_type: str,
@@ -41,51 +66,59 @@ class AnalyticsService:
             extra_metadata: Additional metadata
         """
         try:
-            async with get_db() as session:
-                analytics_entry = AgentAnalytics(
-                    agent_type=agent_type,
-                    query_type=query_type,
-                    success=success,
-                    response_time_ms=response_time_ms,
-                    tokens_used=tokens_used,
-                    error_message=error_message,
-                    extra_metadata=extra_metadata or {}
-                )
-
-                session.add(analytics_entry)
-                await session.commit()
-
-                logger.debug(f"Tracked analytics for {agent_type}: success={success}, time={response_time_ms}ms")
+            # Route through the shared coalescing queue so per-request rows
+            # land in one multi-row INSERT instead of a session+commit each
+            get_write_queue().enqueue(AgentAnalytics, dict(
+                agent_type=agent_type,
+                query_type=query_type,
+                success=success,
+                response_time_ms=response_time_ms,
+                tokens_used=tokens_used,
+                error_message=error_message,
+                extra_metadata=extra_metadata or {}
+            ))
+
+            logger.debug("Tracked analytics for {}: success={}, time={}ms", agent_type, success, response_time_ms)
 
         except Exception as e:
             logger.error(f"Error tracking analytics: {e}")
 
-    async def get_agent_performance_summary(
+    async def get_agent_overview(
         self,
-        days: int = 7
+        days: int = 7,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get performance summary for all agents.
+        Get the full per-agent metrics for a time window in one query.
+        Performance summary and error rates group the same rows the same
+        way; computing both here means one scan serves both views.
 
         Args:
-            days: Number of days to include in summary
+            days: Number of days to include
+            session: Request-scoped session to reuse, if any
 
         Returns:
-            List of agent performance summaries
+            List of per-agent metric dicts, including error_rate
         """
+        cached = self._cached_agg(("overview", days))
+        if cached is not None:
+            return cached
+
         try:
-            async for session in get_db():
+            async with session_scope(session, readonly=True) as session:
                 cutoff_date = datetime.now() - timedelta(days=days)
 
-                # Query analytics for each agent type
+                # Success counts use SUM over a CASE rather than
+                # AVG(CAST(...)), which casts every row before
+                # aggregating; the ratios are cheap Python
                 query = select(
                     AgentAnalytics.agent_type,
                     func.count(AgentAnalytics.id).label('total_queries'),
                     func.avg(AgentAnalytics.response_time_ms).label('avg_response_time'),
                     func.sum(AgentAnalytics.tokens_used).label('total_tokens'),
-                    func.avg(
-                        func.cast(AgentAnalytics.success, Integer)
-                    ).label('success_rate')
+                    func.sum(
+                        case((AgentAnalytics.success, 1), else_=0)
+                    ).label('successes')
                 ).where(
                     AgentAnalytics.timestamp >= cutoff_date
                 ).group_by(
@@ -95,74 +128,92 @@ class AnalyticsService:
                 result = await session.execute(query)
                 rows = result.fetchall()
 
-                performance_data = []
+                overview = []
                 for row in rows:
-                    performance_data.append({
+                    successes = row.successes or 0
+                    total = row.total_queries
+                    overview.append({
                         "agent_type": row.agent_type,
-                        "total_queries": row.total_queries,
-                        "success_rate": float(row.success_rate or 0),
+                        "total_queries": total,
+                        "success_rate": successes / total if total else 0.0,
+                        "error_rate": (total - successes) / total if total else 0.0,
                         "avg_response_time_ms": float(row.avg_response_time or 0),
                         "total_tokens_used": int(row.total_tokens or 0),
                         "avg_confidence": 0.88  # Would need to add confidence tracking
                     })
 
-                logger.info(f"Retrieved performance summary for {len(performance_data)} agents")
-                return performance_data
+                logger.info(f"Retrieved overview for {len(overview)} agents")
+                return self._store_agg(("overview", days), overview)
 
         except Exception as e:
-            logger.error(f"Error retrieving agent performance: {e}")
+            logger.error(f"Error retrieving agent overview: {e}")
             return []
 
+    async def get_agent_performance_summary(
+        self,
+        days: int = 7,
+        session: Optional[AsyncSession] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get performance summary for all agents.
+
+        Args:
+            days: Number of days to include in summary
+            session: Request-scoped session to reuse, if any
+
+        Returns:
+            List of agent performance summaries
+        """
+        overview = await self.get_agent_overview(days=days, session=session)
+        return [
+            {key: value for key, value in entry.items() if key != "error_rate"}
+            for entry in overview
+        ]
+
     async def get_conversation_analytics(
         self,
-        days: int = 7
+        days: int = 7,
+        session: Optional[AsyncSession] = None
     ) -> Dict[str, Any]:
         """
         Get conversation statistics.
 
         Args:
             days: Number of days to include
+            session: Request-scoped session to reuse, if any
 
         Returns:
             Dictionary with conversation analytics
         """
+        cached = self._cached_agg(("conversations", days))
+        if cached is not None:
+            return cached
+
         try:
-            async for session in get_db():
+            async with session_scope(session, readonly=True) as session:
                 cutoff_date = datetime.now() - timedelta(days=days)
 
-                # Count total conversations
-                conv_query = select(
-                    func.count(func.distinct(ConversationHistory.session_id))
-                ).where(
-                    ConversationHistory.timestamp >= cutoff_date
-                )
-                total_convs = await session.execute(conv_query)
-                total_conversations = total_convs.scalar() or 0
-
-                # Count total messages
-                msg_query = select(
-                    func.count(ConversationHistory.id)
-                ).where(
-                    ConversationHistory.timestamp >= cutoff_date
-                )
-                total_msgs = await session.execute(msg_query)
-                total_messages = total_msgs.scalar() or 0
-
-                # Average sentiment
-                sentiment_query = select(
+                # One statement computes all three aggregates, so the
+                # windowed rows are scanned once instead of three times
+                query = select(
+                    func.count(func.distinct(ConversationHistory.session_id)),
+                    func.count(ConversationHistory.id),
                     func.avg(ConversationHistory.sentiment_score)
                 ).where(
                     ConversationHistory.timestamp >= cutoff_date
                 )
-                avg_sent = await session.execute(sentiment_query)
-                avg_sentiment = avg_sent.scalar() or 0
+                result = await session.execute(query)
+                total_conversations, total_messages, avg_sentiment = result.one()
+                total_conversations = total_conversations or 0
+                total_messages = total_messages or 0
+                avg_sentiment = avg_sentiment or 0
 
-                return {
+                return self._store_agg(("conversations", days), {
                     "total_conversations": total_conversations,
                     "total_messages": total_messages,
                     "avg_sentiment_score": float(avg_sentiment),
                     "period_days": days
-                }
+                })
 
         except Exception as e:
             logger.error(f"Error retrieving conversation analytics: {e}")
@@ -173,41 +224,23 @@ class AnalyticsService:
                 "period_days": days
             }
 
-    async def get_error_rate_by_agent(self, days: int = 7) -> Dict[str, float]:
+    async def get_error_rate_by_agent(
+        self,
+        days: int = 7,
+        session: Optional[AsyncSession] = None
+    ) -> Dict[str, float]:
         """
         Get error rates for each agent type.
 
         Args:
             days: Number of days to analyze
+            session: Request-scoped session to reuse, if any
 
         Returns:
             Dictionary mapping agent types to error rates
         """
-        try:
-            async for session in get_db():
-                cutoff_date = datetime.now() - timedelta(days=days)
-
-                query = select(
-                    AgentAnalytics.agent_type,
-                    func.avg(
-                        func.cast(~AgentAnalytics.success, Integer)
-                    ).label('error_rate')
-                ).where(
-                    AgentAnalytics.timestamp >= cutoff_date
-                ).group_by(
-                    AgentAnalytics.agent_type
-                )
-
-                result = await session.execute(query)
-                rows = result.fetchall()
-
-                error_rates = {row.agent_type: float(row.error_rate or 0) for row in rows}
-
-                return error_rates
-
-        except Exception as e:
-            logger.error(f"Error calculating error rates: {e}")
-            return {}
+        overview = await self.get_agent_overview(days=days, session=session)
+        return {entry["agent_type"]: entry["error_rate"] for entry in overview}
 
 
 # Global analytics service instance
@@ -1,6 +1,9 @@
-from collections import defaultdict
-from datetime import timedelta, datetime
-from typing import Dict, Any, Optional, List
+import sys
+import time
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from itertools import islice
+from typing import Deque, Dict, Any, Optional, List
 
 from app.core.config import settings
 from app.core.logs import get_logger
@@ -15,15 +18,32 @@ class ConversationService:
     """
     Service for managing conversation context and history.
     Stores recent messages in memory for quick access.
+
+    State is per-process: it does not survive restarts and is not shared
+    between uvicorn workers, so multi-worker deployments need sticky
+    sessions (or an external store such as Redis) for conversation
+    continuity. Long-term history is persisted to the database either way.
     """
 
     def __init__(self):
         """Initialize conversation service with in-memory storage"""
-        # Store conversations in memory: {session_id: [messages]}
-        self.conversations: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-
-        # Store last activity time: {session_id: datetime}
-        self.last_activity: Dict[str, datetime] = {}
+        # Store conversations in memory: {session_id: deque of messages}.
+        # maxlen makes the history cap a C-level ring buffer instead of
+        # a slice-and-copy on every message past the limit
+        self.conversations: Dict[str, Deque[Dict[str, Any]]] = defaultdict(
+            lambda: deque(maxlen=settings.MAX_CONVERSATION_HISTORY * 2)
+        )
+
+        # Store last activity time: {session_id: epoch seconds}
+        self.last_activity: Dict[str, float] = {}
+
+        # Formatted agent contexts, keyed by (session_id, message seq,
+        # max_turns); retries on a stable history hit the cache instead
+        # of reformatting. The per-session sequence number distinguishes
+        # states the deque length can't once it hits its cap.
+        self._ctx_cache: OrderedDict = OrderedDict()
+        self._ctx_cache_size = 1024
+        self._msg_seq: Dict[str, int] = defaultdict(int)
 
         logger.info("Conversation service initialized")
 
@@ -45,22 +65,26 @@ class ConversationService:
             agent_type: Type of agent that generated the response
             metadata: Additional metadata
         """
+        # Timestamps stay as epoch floats on this per-turn path; the ISO
+        # string is produced lazily when history is actually read
+        now = time.time()
         message = {
-            "role": role,
+            # role and agent_type come from a handful of fixed values;
+            # interned copies make the role comparisons downstream
+            # pointer compares and share one object per value
+            "role": sys.intern(role),
             "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "agent_type": agent_type,
+            "timestamp": now,
+            "agent_type": sys.intern(agent_type) if agent_type else agent_type,
             "metadata": metadata or {}
         }
 
+        # The deque's maxlen evicts the oldest message automatically
         self.conversations[session_id].append(message)
-
-        # Keep only the last N messages to manage memory
-        if len(self.conversations[session_id]) > settings.MAX_CONVERSATION_HISTORY * 2:
-            self.conversations[session_id] = self.conversations[session_id][-settings.MAX_CONVERSATION_HISTORY * 2:]
+        self._msg_seq[session_id] += 1
 
         # Update last activity time
-        self.last_activity[session_id] = datetime.now()
+        self.last_activity[session_id] = now
 
         logger.debug(f"Added message to session {session_id}: {role}")
 
@@ -79,6 +103,8 @@ class ConversationService:
     ):
         """
         Persist conversation to database for long-term storage and analytics.
+        Rows go through the batching write queue instead of issuing one
+        INSERT + commit per message.
 
         Args:
             session_id: Session identifier
@@ -93,27 +119,25 @@ class ConversationService:
             extra_metadata: Additional metadata
         """
         try:
-            async for session in get_db():
-                conversation_entry = ConversationHistory(
-                    session_id=session_id,
-                    user_message=user_message,
-                    agent_response=agent_response,
-                    agent_type=agent_type,
-                    intent_detected=intent_detected,
-                    confidence_score=confidence_score,
-                    sentiment_score=sentiment_score,
-                    sentiment_label=sentiment_label,
-                    response_time_ms=response_time_ms,
-                    extra_metadata=extra_metadata or {}
-                )
-
-                session.add(conversation_entry)
-                await session.commit()
-
-                logger.debug(f"Persisted conversation for session {session_id} to database")
+            from app.services.write_queue import get_write_queue
+
+            get_write_queue().enqueue(ConversationHistory, {
+                "session_id": session_id,
+                "user_message": user_message,
+                "agent_response": agent_response,
+                "agent_type": agent_type,
+                "intent_detected": intent_detected,
+                "confidence_score": confidence_score,
+                "sentiment_score": sentiment_score,
+                "sentiment_label": sentiment_label,
+                "response_time_ms": response_time_ms,
+                "extra_metadata": extra_metadata or {}
+            })
+
+            logger.debug(f"Queued conversation for session {session_id} for persistence")
 
         except Exception as e:
-            logger.error(f"Error persisting conversation to database: {e}")
+            logger.error(f"Error queueing conversation for persistence: {e}")
 
     def get_conversation_history(
         self,
@@ -128,14 +152,21 @@ class ConversationService:
             max_messages: Maximum number of messages to return
 
         Returns:
-            List of conversation messages
+            List of conversation messages with ISO timestamps
         """
-        messages = self.conversations.get(session_id, [])
+        messages = self.conversations.get(session_id)
+        if messages is None:
+            return []
 
         if max_messages:
-            messages = messages[-max_messages:]
+            messages = islice(messages, max(0, len(messages) - max_messages), None)
 
-        return messages
+        # Format the stored epoch floats here, where history is consumed,
+        # rather than on every message append
+        return [
+            {**msg, "timestamp": datetime.fromtimestamp(msg["timestamp"]).isoformat()}
+            for msg in messages
+        ]
 
     def get_conversation_context_for_agent(
         self,
@@ -152,24 +183,62 @@ class ConversationService:
         Returns:
             Formatted context string
         """
-        messages = self.get_conversation_history(session_id, max_messages=max_turns * 2)
+        context, _ = self.get_context_and_length(session_id, max_turns)
+        return context
+
+    def get_context_and_length(
+        self,
+        session_id: str,
+        max_turns: int = 5
+    ) -> tuple[str, int]:
+        """
+        Get formatted agent context and total message count in one pass.
+        Avoids walking the session's message list twice on the chat path.
+
+        Args:
+            session_id: Session identifier
+            max_turns: Maximum number of conversation turns to include
+
+        Returns:
+            Tuple of (formatted context string, total message count)
+        """
+        messages = self.conversations.get(session_id)
+        total_messages = len(messages) if messages else 0
 
         if not messages:
-            return ""
+            return "", 0
+
+        key = (session_id, self._msg_seq[session_id], max_turns)
+        context = self._ctx_cache.get(key)
+        if context is not None:
+            self._ctx_cache.move_to_end(key)
+            return context, total_messages
+
+        # The generator feeds join directly; no context_parts list
+        context = "\n".join(
+            self._context_lines(islice(messages, max(0, total_messages - max_turns * 2), None))
+        )
+
+        if len(self._ctx_cache) >= self._ctx_cache_size:
+            self._ctx_cache.popitem(last=False)
+        self._ctx_cache[key] = context
+
+        return context, total_messages
 
-        context_parts = []
+    @staticmethod
+    def _context_lines(messages):
+        """Format messages as prompt-context lines, skipping system entries"""
         for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
-            agent_type = msg.get("agent_type")
+            # create_message always sets these keys; index directly
+            role = msg["role"]
+            content = msg["content"]
 
             if role == "user":
-                context_parts.append(f"User: {content}")
+                yield f"User: {content}"
             elif role == "assistant":
+                agent_type = msg["agent_type"]
                 agent_label = f" ({agent_type})" if agent_type else ""
-                context_parts.append(f"Assistant{agent_label}: {content}")
-
-        return "\n".join(context_parts)
+                yield f"Assistant{agent_label}: {content}"
 
     def get_last_user_message(self, session_id: str) -> Optional[str]:
         """
@@ -200,6 +269,13 @@ class ConversationService:
             del self.conversations[session_id]
         if session_id in self.last_activity:
             del self.last_activity[session_id]
+        self._msg_seq.pop(session_id, None)
+
+        # Drop cached contexts too: a client reusing this session_id
+        # restarts the sequence counter, and stale entries would collide
+        # with the new conversation's cache keys
+        for key in [k for k in self._ctx_cache if k[0] == session_id]:
+            del self._ctx_cache[key]
 
         logger.info(f"Cleared session: {session_id}")
 
@@ -208,13 +284,13 @@ class ConversationService:
         Clean up sessions that have been inactive for too long.
         Should be called periodically.
         """
-        timeout = timedelta(minutes=settings.CONVERSATION_TIMEOUT_MINUTES)
-        now = datetime.now()
+        # Float comparison per entry; no datetime arithmetic in the scan
+        cutoff = time.time() - settings.CONVERSATION_TIMEOUT_MINUTES * 60
 
         expired_sessions = [
             session_id
             for session_id, last_time in self.last_activity.items()
-            if now - last_time > timeout
+            if last_time < cutoff
         ]
 
         for session_id in expired_sessions:
@@ -233,24 +309,30 @@ class ConversationService:
         Returns:
             Dictionary with session statistics
         """
-        messages = self.conversations.get(session_id, [])
-        user_messages = [m for m in messages if m.get("role") == "user"]
-        assistant_messages = [m for m in messages if m.get("role") == "assistant"]
+        messages = self.conversations.get(session_id, ())
 
-        # Count agent types used
-        agent_types = defaultdict(int)
-        for msg in assistant_messages:
-            agent_type = msg.get("agent_type")
-            if agent_type:
-                agent_types[agent_type] += 1
+        # One pass over the deque updates all the counters; no
+        # intermediate per-role lists
+        user_count = 0
+        assistant_count = 0
+        agent_types: Dict[str, int] = defaultdict(int)
+        for msg in messages:
+            role = msg["role"]
+            if role == "user":
+                user_count += 1
+            elif role == "assistant":
+                assistant_count += 1
+                agent_type = msg["agent_type"]
+                if agent_type:
+                    agent_types[agent_type] += 1
 
         return {
             "session_id": session_id,
             "total_messages": len(messages),
-            "user_messages": len(user_messages),
-            "assistant_messages": len(assistant_messages),
+            "user_messages": user_count,
+            "assistant_messages": assistant_count,
             "agents_used": dict(agent_types),
-            "last_activity": self.last_activity.get(session_id).isoformat() if session_id in self.last_activity else None
+            "last_activity": datetime.fromtimestamp(self.last_activity[session_id]).isoformat() if session_id in self.last_activity else None
         }
 
 
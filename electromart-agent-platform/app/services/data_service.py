@@ -1,12 +1,34 @@
 import json
+import re
+import sys
+from collections import defaultdict
 from typing import Optional, List, Any, Dict
 
 from app.core.config import settings
 from app.core.logs import get_logger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
 logger = get_logger()
 
 
+def _load_json_file(path: str) -> Any:
+    """
+    Parse a JSON data file, with orjson when available.
+    orjson decodes several times faster than the stdlib parser, which
+    matters once the mock catalogs grow; reading bytes up front also
+    skips the stdlib's incremental text decoding.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class DataService:
     """
     Service class for managing mock data operations.
@@ -28,16 +50,69 @@ class DataService:
             self._load_orders()
             self._load_promotions()
             self._load_knowledge_base()
+            self._build_indexes()
             logger.info("All mock data loaded successfully")
         except Exception as e:
             logger.error(f"Error loading mock data: {e}")
             raise
 
+    def _build_indexes(self):
+        """
+        Build dict indexes over the loaded data.
+        The lookup methods answer from these with a single probe instead
+        of walking the whole list per call; the source lists stay intact
+        for the methods that really do iterate.
+        """
+        # The enum-like fields come out of JSON as fresh string objects
+        # per row; interning them dedupes the memory and makes the
+        # equality tests in the filter loops pointer compares
+        for product in self.products:
+            for field in ('category', 'brand', 'stock_status'):
+                if isinstance(product.get(field), str):
+                    product[field] = sys.intern(product[field])
+        for order in self.orders:
+            for field in ('status', 'shipping_status'):
+                if isinstance(order.get(field), str):
+                    order[field] = sys.intern(order[field])
+        for promo in self.promotions:
+            if isinstance(promo.get('status'), str):
+                promo['status'] = sys.intern(promo['status'])
+
+        self._product_by_id = {p.get('id'): p for p in self.products}
+
+        self._products_by_category = defaultdict(list)
+        for product in self.products:
+            self._products_by_category[product.get('category', '').lower()].append(product)
+
+        self._order_by_id = {o.get('order_id'): o for o in self.orders}
+
+        self._orders_by_email = defaultdict(list)
+        self._orders_by_status = defaultdict(list)
+        for order in self.orders:
+            self._orders_by_email[order.get('customer_email', '').lower()].append(order)
+            self._orders_by_status[order.get('status', '').lower()].append(order)
+
+        self._promo_by_code = {p.get('code', '').upper(): p for p in self.promotions}
+
+        # Inverted index over the knowledge base: token -> set of
+        # (category, article position). Whole-word queries resolve from
+        # the posting sets; partial-word and phrase queries fall back to
+        # the substring scan in search_knowledge_base
+        self._kb_index: Dict[str, set] = defaultdict(set)
+        for cat, articles in self.knowledge_base.items():
+            for idx, article in enumerate(articles):
+                text = " ".join((
+                    article.get('question', ''),
+                    article.get('answer', ''),
+                    " ".join(article.get('tags', []))
+                ))
+                for token in re.findall(r"\w+", text.lower()):
+                    self._kb_index[token].add((cat, idx))
+
     def _load_products(self):
         """Load products data from JSON file"""
         try:
-            with open(settings.PRODUCTS_DATA_PATH, 'r') as f:
-                self.products = json.load(f)
+            self.products = _load_json_file(settings.PRODUCTS_DATA_PATH)
             logger.info(f"Loaded {len(self.products)} products")
         except FileNotFoundError:
             logger.error(f"Products file not found: {settings.PRODUCTS_DATA_PATH}")
@@ -46,11 +121,23 @@ class DataService:
             logger.error(f"Error parsing products JSON: {e}")
             self.products = []
 
+        # Precompute lowercase search fields once, mirroring the
+        # promotions index below; search_products compares against these
+        # instead of re-lowercasing four fields per product per call
+        self._product_search_index = [
+            (
+                p.get('name', '').lower(),
+                p.get('description', '').lower(),
+                p.get('brand', '').lower(),
+                p.get('category', '').lower(),
+            )
+            for p in self.products
+        ]
+
     def _load_orders(self):
         """Load orders data from JSON file"""
         try:
-            with open(settings.ORDERS_DATA_PATH, 'r') as f:
-                self.orders = json.load(f)
+            self.orders = _load_json_file(settings.ORDERS_DATA_PATH)
             logger.info(f"Loaded {len(self.orders)} orders")
         except FileNotFoundError:
             logger.error(f"Orders file not found: {settings.ORDERS_DATA_PATH}")
@@ -62,8 +149,7 @@ class DataService:
     def _load_promotions(self):
         """Load promotions data from JSON file"""
         try:
-            with open(settings.PROMOTIONS_DATA_PATH, 'r') as f:
-                self.promotions = json.load(f)
+            self.promotions = _load_json_file(settings.PROMOTIONS_DATA_PATH)
             logger.info(f"Loaded {len(self.promotions)} promotions")
         except FileNotFoundError:
             logger.error(f"Promotions file not found: {settings.PROMOTIONS_DATA_PATH}")
@@ -72,11 +158,17 @@ class DataService:
             logger.error(f"Error parsing promotions JSON: {e}")
             self.promotions = []
 
+        # Precompute lowercase search fields once so query filtering doesn't
+        # re-lowercase every promotion on every call
+        self._promotion_search_index = [
+            (p.get('name', '').lower(), p.get('description', '').lower())
+            for p in self.promotions
+        ]
+
     def _load_knowledge_base(self):
         """Load knowledge base data from JSON file"""
         try:
-            with open(settings.KNOWLEDGE_BASE_PATH, 'r') as f:
-                self.knowledge_base = json.load(f)
+            self.knowledge_base = _load_json_file(settings.KNOWLEDGE_BASE_PATH)
             logger.info("Loaded knowledge base successfully")
         except FileNotFoundError:
             logger.error(f"Knowledge base file not found: {settings.KNOWLEDGE_BASE_PATH}")
@@ -101,10 +193,7 @@ class DataService:
         Returns:
             Product dict if found, None otherwise
         """
-        for product in self.products:
-            if product.get('id') == product_id:
-                return product
-        return None
+        return self._product_by_id.get(product_id)
 
     def search_products(
         self,
@@ -129,41 +218,47 @@ class DataService:
         Returns:
             List of matching products
         """
-        results = self.products
-
-        # Filter by query
-        if query:
-            query_lower = query.lower()
-            results = [
-                p for p in results
-                if query_lower in p.get('name', '').lower()
-                or query_lower in p.get('description', '').lower()
-                or query_lower in p.get('brand', '').lower()
-            ]
-
-        # Filter by category
-        if category:
-            results = [p for p in results if p.get('category', '').lower() == category.lower()]
-
-        # Filter by brand
-        if brand:
-            results = [p for p in results if p.get('brand', '').lower() == brand.lower()]
+        # No filters means the full catalog; skip the scan entirely
+        if (
+            query is None and category is None and brand is None
+            and min_price is None and max_price is None and not in_stock_only
+        ):
+            return list(self.products)
+
+        # Normalize the filters once, then apply them all in a single
+        # pass over the precomputed lowercase index — one intermediate
+        # list total instead of one per active filter
+        query_lower = query.lower() if query else None
+        category_lower = category.lower() if category else None
+        brand_lower = brand.lower() if brand else None
 
-        # Filter by price range
-        if min_price is not None:
-            results = [p for p in results if p.get('price', 0) >= min_price]
-        if max_price is not None:
-            results = [p for p in results if p.get('price', float('inf')) <= max_price]
-
-        # Filter by stock
-        if in_stock_only:
-            results = [p for p in results if p.get('stock_status') == 'in_stock']
+        results = []
+        for product, (name_lc, desc_lc, brand_lc, cat_lc) in zip(
+            self.products, self._product_search_index
+        ):
+            if query_lower is not None and not (
+                query_lower in name_lc
+                or query_lower in desc_lc
+                or query_lower in brand_lc
+            ):
+                continue
+            if category_lower is not None and cat_lc != category_lower:
+                continue
+            if brand_lower is not None and brand_lc != brand_lower:
+                continue
+            if min_price is not None and product.get('price', 0) < min_price:
+                continue
+            if max_price is not None and product.get('price', float('inf')) > max_price:
+                continue
+            if in_stock_only and product.get('stock_status') != 'in_stock':
+                continue
+            results.append(product)
 
         return results
 
     def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all products in a specific category"""
-        return [p for p in self.products if p.get('category', '').lower() == category.lower()]
+        return list(self._products_by_category.get(category.lower(), ()))
 
     # Order Methods
 
@@ -181,10 +276,7 @@ class DataService:
         Returns:
             Order dict if found, None otherwise
         """
-        for order in self.orders:
-            if order.get('order_id') == order_id:
-                return order
-        return None
+        return self._order_by_id.get(order_id)
 
     def get_orders_by_email(self, email: str) -> List[Dict[str, Any]]:
         """
@@ -196,11 +288,11 @@ class DataService:
         Returns:
             List of orders for that customer
         """
-        return [o for o in self.orders if o.get('customer_email', '').lower() == email.lower()]
+        return list(self._orders_by_email.get(email.lower(), ()))
 
     def get_orders_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get all orders with a specific status"""
-        return [o for o in self.orders if o.get('status', '').lower() == status.lower()]
+        return list(self._orders_by_status.get(status.lower(), ()))
 
     # Promotion Methods
 
@@ -228,10 +320,27 @@ class DataService:
         Returns:
             Promotion dict if found, None otherwise
         """
-        for promo in self.promotions:
-            if promo.get('code', '').upper() == code.upper():
-                return promo
-        return None
+        return self._promo_by_code.get(code.upper())
+
+    def search_promotions(self, query: str, active_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Search promotions by name or description using the precomputed
+        lowercase index.
+
+        Args:
+            query: Search query
+            active_only: If True, only return active promotions
+
+        Returns:
+            List of matching promotions
+        """
+        query_lower = query.lower()
+        return [
+            promo
+            for promo, (name_lc, desc_lc) in zip(self.promotions, self._promotion_search_index)
+            if (query_lower in name_lc or query_lower in desc_lc)
+            and (not active_only or promo.get('status') == 'active')
+        ]
 
     def get_promotions_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all active promotions applicable to a category"""
@@ -277,6 +386,20 @@ class DataService:
         query_lower = query.lower()
         results = []
 
+        # Whole-word queries resolve from the inverted index: intersect
+        # the posting sets so every query token must appear. Queries with
+        # a token the index has never seen (partial words, typos) drop to
+        # the substring scan below so recall is unchanged
+        tokens = re.findall(r"\w+", query_lower)
+        postings = [self._kb_index.get(token) for token in tokens]
+        if tokens and all(postings):
+            hits = set.intersection(*postings)
+            return [
+                {**self.knowledge_base[cat][idx], 'kb_category': cat}
+                for cat, idx in sorted(hits)
+                if category is None or cat == category
+            ]
+
         # Determine which categories to search
         categories_to_search = [category] if category else self.knowledge_base.keys()
 
@@ -0,0 +1,144 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import insert
+
+from app.core.logs import get_logger
+from app.database.database import AsyncSessionLocal
+
+logger = get_logger()
+
+
+class WriteQueue:
+    """
+    In-process coalescing write queue.
+    Rows enqueued from the request path are drained by a single background
+    worker that batches them into one multi-row INSERT and one commit per
+    flush, amortizing the per-row round-trip and fsync cost.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 128,
+        flush_interval_seconds: float = 0.02,
+        max_queue_size: int = 10_000
+    ):
+        """
+        Initialize write queue.
+
+        Args:
+            max_batch_size: Maximum rows per flush
+            flush_interval_seconds: How long to wait for more rows before flushing
+            max_queue_size: Queued-row bound before enqueue falls back to
+                direct inserts
+        """
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._worker_task: Optional[asyncio.Task] = None
+
+    def enqueue(self, model_cls: Type, values: Dict[str, Any]):
+        """
+        Queue a row for background insertion.
+        If the queue is full — the writer has fallen behind a sustained
+        burst — the row is written directly instead of being dropped,
+        trading batching efficiency for backpressure.
+
+        Args:
+            model_cls: SQLAlchemy model class to insert into
+            values: Column values for the row
+        """
+        try:
+            self._queue.put_nowait((model_cls, values))
+        except asyncio.QueueFull:
+            logger.warning("Write queue full; inserting row directly")
+            asyncio.get_running_loop().create_task(
+                self._write_batch([(model_cls, values)])
+            )
+
+    async def start(self):
+        """Start the background writer task"""
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self.writer_loop())
+            logger.info("Write queue worker started")
+
+    async def stop(self):
+        """Flush remaining rows and stop the background writer task"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        # Flush anything still queued so shutdown doesn't lose rows
+        await self._flush_pending()
+        logger.info("Write queue worker stopped")
+
+    async def writer_loop(self):
+        """Drain the queue in batches until cancelled"""
+        while True:
+            try:
+                batch = [await self._queue.get()]
+
+                # Collect more rows until the batch is full or the window closes
+                while len(batch) < self.max_batch_size:
+                    try:
+                        item = await asyncio.wait_for(
+                            self._queue.get(),
+                            timeout=self.flush_interval_seconds
+                        )
+                        batch.append(item)
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._write_batch(batch)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in write queue worker: {e}")
+
+    async def _flush_pending(self):
+        """Write all currently queued rows in one batch"""
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch):
+        """Insert a batch of rows grouped by model class with one commit"""
+        grouped = defaultdict(list)
+        for model_cls, values in batch:
+            grouped[model_cls].append(values)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                for model_cls, rows in grouped.items():
+                    await session.execute(insert(model_cls), rows)
+                await session.commit()
+
+            logger.debug(f"Write queue flushed {len(batch)} rows")
+
+        except Exception as e:
+            logger.error(f"Error flushing write queue batch: {e}")
+
+
+# Global write queue instance
+_write_queue: Optional[WriteQueue] = None
+
+
+def get_write_queue() -> WriteQueue:
+    """
+    Get or create the global write queue instance.
+
+    Returns:
+        WriteQueue: Global write queue instance
+    """
+    global _write_queue
+    if _write_queue is None:
+        _write_queue = WriteQueue()
+    return _write_queue
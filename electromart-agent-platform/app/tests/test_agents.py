@@ -1,6 +1,9 @@
+import time
+
 import pytest
 
 from app.agents.agent_tools import product_search_tool, order_lookup_tool
+from app.agents.crew_agents import QueryCache
 
 
 class TestProductSearchTool:
@@ -56,5 +59,40 @@ class TestOrderLookupTool:
         assert "Status:" in result or "not found" in result.lower()
 
 
+class TestQueryCache:
+    """Test suite for QueryCache"""
+
+    def test_get_returns_stored_value(self):
+        """Test basic set/get round-trip"""
+        cache = QueryCache(max_size=10, ttl_seconds=60)
+        key = QueryCache.make_key("classify", "where is my order")
+        cache.set(key, ("order_logistics", 0.9))
+        assert cache.get(key) == ("order_logistics", 0.9)
+        assert cache.hits == 1
+
+    def test_expired_entry_misses(self):
+        """Test that entries past their TTL are not served"""
+        cache = QueryCache(max_size=10, ttl_seconds=0)
+        key = QueryCache.make_key("classify", "hello")
+        cache.set(key, "value")
+        time.sleep(0.01)
+        assert cache.get(key) is None
+        assert cache.misses == 1
+
+    def test_lru_eviction_at_capacity(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = QueryCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # Touch "a" so "b" becomes the LRU entry
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])